@@ -39,6 +39,8 @@ SPOTIFY_SCOPE = (
 PROJECT_ROOT = os.path.dirname(os.path.dirname(__file__)) # Root is one level up from src
 CACHE_DIR = PROJECT_ROOT # Store cache files in the root directory
 DATA_FILE = os.path.join(PROJECT_ROOT, "spotify_data.json") # Default data file name in root
+PLAYLIST_CACHE_FILE = os.path.join(CACHE_DIR, ".playlist_cache.sqlite3") # Track lists from previous exports
+PLAYLIST_CACHE_TTL = 7 * 24 * 60 * 60 # seconds; unchanged playlists are refetched after a week regardless
 
 # --- Validation ---
 def validate_config() -> bool:
@@ -63,5 +65,6 @@ def validate_config() -> bool:
     logger.debug("Configuration validated successfully.")
     return True
 
-# Perform validation when the module is loaded
-IS_CONFIG_VALID = validate_config()
\ No newline at end of file
+def update_values(**values: str):
+    """Applies saved settings (e.g. CLIENT_ID='...') to this module without reloading it."""
+    globals().update(values)
@@ -1,47 +1,248 @@
+import os
+import gzip
+import contextlib
+import io
 import json
+import mmap
 import logging
-from typing import Dict, Any, Optional
+import threading
+from typing import Dict, Any, Iterable, Optional, Tuple
+
+try:
+    import orjson # Optional: much faster (de)serialization for large exports
+except ImportError:
+    orjson = None
+
+try:
+    import ijson # Optional: incremental parsing of very large data files
+except ImportError:
+    ijson = None
+
+try:
+    import zstandard # Optional: .zst compression, faster and smaller than gzip
+except ImportError:
+    zstandard = None
 
 logger = logging.getLogger(__name__)
 
+GZIP_SUFFIX = '.gz'
+TMP_SUFFIX = '.tmp' # Appended to the target path while a write is in progress
+GZIP_COMPRESS_LEVEL = 1 # Favour write speed; track URIs are repetitive enough to compress well at level 1
+ZSTD_SUFFIX = '.zst'
+ZSTD_COMPRESS_LEVEL = 3 # zstd's default; compresses faster than the uncompressed bytes could be written
+COMPACT_SEPARATORS = (',', ':') # Matches orjson's default output
+WRITE_BUFFER_SIZE = 1 << 20 # bytes; the streamed export issues one small write per playlist and per URI
+STREAM_PARSE_THRESHOLD = 16 * 1024 * 1024 # bytes on disk; smaller files parse faster in one call
+
+# Last successfully loaded file, keyed by (absolute path, mtime_ns, size)
+_load_cache: Dict[Tuple[str, int, int], Dict[str, Any]] = {}
+_load_cache_lock = threading.Lock()
+
+# Top-level keys every data file must have, and the type each holds
+DATA_SCHEMA = {'playlists': list, 'liked_songs': list}
+
+# orjson.JSONDecodeError already subclasses json.JSONDecodeError
+_DECODE_ERRORS = (json.JSONDecodeError,) + ((ijson.JSONError,) if ijson is not None else ())
+
+def _is_compressed(filepath: str) -> bool:
+    """Returns whether the data file at this path is stored compressed."""
+    return filepath.endswith((GZIP_SUFFIX, ZSTD_SUFFIX))
+
+def _require_zstandard(filepath: str):
+    """Returns the zstandard module, or raises IOError naming the missing package."""
+    if zstandard is None:
+        raise IOError(f"{filepath} is zstd-compressed, which requires the optional zstandard package (pip install zstandard)")
+    return zstandard
+
+def _open_data_file(filepath: str, mode: str, encoding: Optional[str] = None):
+    """Opens a data file for reading, transparently decompressing paths that end in .gz or .zst."""
+    if filepath.endswith(ZSTD_SUFFIX):
+        reader = _require_zstandard(filepath).ZstdDecompressor().stream_reader(open(filepath, 'rb'), closefd=True)
+        return reader if 'b' in mode else io.TextIOWrapper(reader, encoding=encoding)
+    if filepath.endswith(GZIP_SUFFIX):
+        if 'b' not in mode:
+            mode += 't'
+        return gzip.open(filepath, mode, compresslevel=GZIP_COMPRESS_LEVEL, encoding=encoding)
+    return open(filepath, mode, encoding=encoding)
+
+@contextlib.contextmanager
+def _atomic_write(filepath: str):
+    """
+    Opens a data file for binary writing (compressed if the path ends in .gz or .zst) via a temporary file.
+    
+    The temporary file is synced to disk and then swapped in with os.replace, so a crash
+    or error mid-write leaves any previous file intact instead of a truncated one.
+    """
+    tmp_path = filepath + TMP_SUFFIX
+    try:
+        with open(tmp_path, 'wb', buffering=WRITE_BUFFER_SIZE) as raw:
+            if filepath.endswith(GZIP_SUFFIX):
+                with gzip.GzipFile(filename=os.path.basename(filepath)[:-len(GZIP_SUFFIX)], mode='wb',
+                                   compresslevel=GZIP_COMPRESS_LEVEL, fileobj=raw) as f:
+                    yield f
+            elif filepath.endswith(ZSTD_SUFFIX):
+                compressor = _require_zstandard(filepath).ZstdCompressor(level=ZSTD_COMPRESS_LEVEL)
+                with compressor.stream_writer(raw, closefd=False) as f:
+                    yield f
+            else:
+                yield raw
+            raw.flush()
+            os.fsync(raw.fileno())
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(tmp_path)
+        raise
+
+def _json_default(obj: Any) -> Any:
+    """Converts values neither encoder handles natively; sets (e.g. of track URIs) become lists."""
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def _dumps(obj: Any) -> bytes:
+    """Serializes a single value to compact UTF-8 JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=_json_default)
+    return json.dumps(obj, ensure_ascii=False, separators=COMPACT_SEPARATORS, default=_json_default).encode('utf-8')
+
 def save_data(data: Dict[str, Any], filepath: str):
-    """Saves the provided data dictionary to a JSON file."""
-    logger.debug(f"Attempting to save data to {filepath}")
+    """Saves the provided data dictionary to a JSON file (compressed if the path ends in .gz or .zst)."""
+    logger.debug("Attempting to save data to %s", filepath)
     try:
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=4, ensure_ascii=False)
+        with _atomic_write(filepath) as f:
+            f.write(_dumps(data))
         logger.info(f"Successfully exported data to {filepath}")
     except IOError as e:
         logger.error(f"Error writing data to file {filepath}: {e}", exc_info=True)
         raise # Re-raise to indicate failure to the caller
-    except TypeError as e:
+    except TypeError as e: # orjson.JSONEncodeError subclasses this
         logger.error(f"Error serializing data to JSON for file {filepath}: {e}", exc_info=True)
         raise
 
+def save_data_stream(playlists: Iterable[Dict[str, Any]], liked_songs: Iterable[str], filepath: str) -> Tuple[int, int]:
+    """
+    Writes export data to a JSON file incrementally.
+    
+    Each playlist is serialized and written as soon as the iterable yields it,
+    so only one playlist needs to be held in memory at a time. The result has
+    the same shape as save_data's output (including compression) and is
+    read back with load_data.
+    
+    Returns:
+        The number of playlists and liked songs written
+    """
+    logger.debug("Attempting to stream data to %s", filepath)
+    playlist_count = 0
+    liked_count = 0
+    try:
+        with _atomic_write(filepath) as f:
+            f.write(b'{"playlists": [')
+            for playlist in playlists:
+                f.write(b',\n' if playlist_count else b'\n')
+                f.write(_dumps(playlist))
+                playlist_count += 1
+            f.write(b'\n], "liked_songs": [')
+            for uri in liked_songs:
+                f.write(b',\n' if liked_count else b'\n')
+                f.write(_dumps(uri))
+                liked_count += 1
+            f.write(b'\n]}\n')
+        logger.info(f"Successfully exported data to {filepath}")
+        return playlist_count, liked_count
+    except IOError as e:
+        logger.error(f"Error writing data to file {filepath}: {e}", exc_info=True)
+        raise
+    except TypeError as e: # orjson.JSONEncodeError subclasses this
+        logger.error(f"Error serializing data to JSON for file {filepath}: {e}", exc_info=True)
+        raise
+
+def _validate_data(data: Any) -> Optional[str]:
+    """Checks loaded data against DATA_SCHEMA, returning a description of the first problem or None."""
+    if not isinstance(data, dict):
+        return f"Expected a dictionary, got {type(data)}."
+    for key, expected_type in DATA_SCHEMA.items():
+        if not isinstance(data.get(key), expected_type):
+            return f"Missing or invalid '{key}' key (should be a {expected_type.__name__})."
+    return None
+
+def _copy_data(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Copies the containers of loaded data so callers can't alter the cached copy; track lists are shared."""
+    copied = dict(data)
+    copied['playlists'] = [dict(p) if isinstance(p, dict) else p for p in data['playlists']]
+    copied['liked_songs'] = list(data['liked_songs'])
+    return copied
+
 def load_data(filepath: str) -> Optional[Dict[str, Any]]:
-    """Loads data from a JSON file."""
-    logger.debug(f"Attempting to load data from {filepath}")
+    """
+    Loads data from a JSON file (compressed if the path ends in .gz or .zst).
+    
+    The last successfully loaded file is kept and reused while its size and
+    modification time are unchanged, so loading the same file again (e.g. a
+    retried import) skips parsing. This holds the whole parsed file in memory
+    until clear_load_cache() is called. Callers get their own top-level dict,
+    lists and playlist dicts, but must not modify playlists' track lists in place.
+    """
+    try:
+        stat = os.stat(filepath)
+    except OSError:
+        return _read_data_file(filepath) # Reports the missing/unreadable file
+    key = (os.path.abspath(filepath), stat.st_mtime_ns, stat.st_size)
+
+    with _load_cache_lock:
+        data = _load_cache.get(key)
+    if data is not None:
+        logger.info(f"Loaded data from {filepath} (unchanged since last load)")
+        return _copy_data(data)
+
+    data = _read_data_file(filepath)
+    if data is None:
+        return None
+    with _load_cache_lock:
+        _load_cache.clear() # Only the most recent file is kept
+        _load_cache[key] = data
+    return _copy_data(data)
+
+def clear_load_cache():
+    """Drops the file kept by load_data, e.g. once the import that loaded it has finished."""
+    with _load_cache_lock:
+        _load_cache.clear()
+
+def _read_data_file(filepath: str) -> Optional[Dict[str, Any]]:
+    """Parses and validates a data file, logging and returning None on any failure."""
+    logger.debug("Attempting to load data from %s", filepath)
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        compressed = _is_compressed(filepath)
+        # orjson parses plain files from an mmap without copying them; anything else would be read
+        # into memory whole before parsing, so large files are streamed with ijson when it's available
+        if (ijson is not None and (orjson is None or compressed)
+                and os.path.getsize(filepath) >= STREAM_PARSE_THRESHOLD):
+            with _open_data_file(filepath, 'rb') as f:
+                data = dict(ijson.kvitems(f, '', use_float=True))
+        elif orjson is not None:
+            with _open_data_file(filepath, 'rb') as f:
+                if compressed or os.fstat(f.fileno()).st_size == 0:
+                    data = orjson.loads(f.read())
+                else:
+                    # Parse straight from the mapped file instead of copying it into a bytes object first
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                        data = orjson.loads(view)
+        else:
+            with _open_data_file(filepath, 'r', encoding='utf-8') as f:
+                data = json.load(f)
         logger.info(f"Successfully loaded data from {filepath}")
         
         # Basic validation
-        if not isinstance(data, dict):
-            logger.error(f"Invalid data format in {filepath}. Expected a dictionary, got {type(data)}.")
+        problem = _validate_data(data)
+        if problem:
+            logger.error(f"Invalid data format in {filepath}. {problem}")
             return None
-        if 'playlists' not in data or not isinstance(data['playlists'], list):
-             logger.error(f"Invalid data format in {filepath}. Missing or invalid 'playlists' key (should be a list).")
-             return None
-        if 'liked_songs' not in data or not isinstance(data['liked_songs'], list):
-             logger.error(f"Invalid data format in {filepath}. Missing or invalid 'liked_songs' key (should be a list).")
-             return None
              
         return data
     except FileNotFoundError:
         logger.error(f"Data file not found: {filepath}")
         return None
-    except json.JSONDecodeError as e:
+    except _DECODE_ERRORS as e:
         logger.error(f"Error decoding JSON from file {filepath}: {e}", exc_info=True)
         return None
     except IOError as e:
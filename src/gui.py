@@ -1,64 +1,75 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 import threading
+import concurrent.futures
 import os
 import sys
 import logging
-import io
+import logging.handlers
+import queue
 from typing import Optional, Callable
 
 # Import modules from the 'src' package
+from dotenv import set_key
+
 from . import config
 from .logger import setup_logging
-from .spotify_manager import SpotifyManager
-from .data_handler import save_data, load_data
+from .data_handler import save_data_stream, load_data, clear_load_cache
 
 # Setup module-level logger
 logger = logging.getLogger(__name__)
 
-class RedirectText(io.StringIO):
-    """Redirect stdout/stderr to a tkinter Text widget."""
-    def __init__(self, text_widget):
-        super().__init__()
-        self.text_widget = text_widget
-        self.root = self.text_widget.winfo_toplevel()
-        
-    def write(self, string):
-        self.text_widget.config(state=tk.NORMAL)
-        self.text_widget.insert(tk.END, string)
-        self.text_widget.see(tk.END)
-        self.text_widget.config(state=tk.DISABLED)
-        # Update the GUI to show new text immediately
-        self.root.update_idletasks()
-        
-    def flush(self):
-        pass
+MAX_LOG_LINES = 5000 # Older lines are dropped so long sessions don't slow the Text widget down
+SAVE_LOGS_CHUNK_LINES = 500 # Lines copied out of the log widget per write in save_logs
+
+def _trim_text(text_widget, max_lines: int = MAX_LOG_LINES):
+    """Delete the oldest lines of a (writable) Text widget beyond max_lines."""
+    # Inserted text ends in a newline, so 'end-1c' sits on the empty line after the last one
+    line_count = int(text_widget.index('end-1c').split('.')[0]) - 1
+    if line_count > max_lines:
+        text_widget.delete('1.0', f'{line_count - max_lines + 1}.0')
+
+class LogHandler(logging.handlers.QueueHandler):
+    """
+    Custom log handler that writes to a tkinter Text widget.
+    
+    Any thread may log through it: emit only formats the record and puts it on a
+    queue. The Tk main thread drains the queue every FLUSH_INTERVAL_MS and writes
+    the batch in a single insert, so a burst of log lines costs one widget update,
+    logging never waits on the widget, and no other thread ever calls into Tk.
+    """
+    FLUSH_INTERVAL_MS = 50
 
-class LogHandler(logging.Handler):
-    """Custom log handler that writes to a tkinter Text widget."""
     def __init__(self, text_widget):
-        super().__init__()
+        super().__init__(queue.SimpleQueue())
         self.text_widget = text_widget
-        
-    def emit(self, record):
-        msg = self.format(record)
-        self.text_widget.config(state=tk.NORMAL)
-        
-        # Add color based on log level
-        if record.levelno >= logging.ERROR:
-            self.text_widget.insert(tk.END, msg + '\n', 'error')
-        elif record.levelno >= logging.WARNING:
-            self.text_widget.insert(tk.END, msg + '\n', 'warning')
-        elif record.levelno >= logging.INFO:
-            self.text_widget.insert(tk.END, msg + '\n', 'info')
-        else:
-            self.text_widget.insert(tk.END, msg + '\n', 'debug')
-            
-        self.text_widget.see(tk.END)
-        self.text_widget.config(state=tk.DISABLED)
-        
-        # Update the GUI
-        self.text_widget.winfo_toplevel().update_idletasks()
+
+    def start(self):
+        """Start draining the queue into the widget; must be called on the Tk main thread."""
+        self.text_widget.after(self.FLUSH_INTERVAL_MS, self._flush)
+
+    def _flush(self):
+        """Write all queued records to the widget in a single insert, then schedule the next drain."""
+        # Text.insert accepts alternating text/tag arguments
+        insert_args = []
+        while True:
+            try:
+                record = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            # Add color based on log level (ERROR=40, WARNING=30, INFO=20, inlined on this per-record path)
+            levelno = record.levelno
+            tag = 'error' if levelno >= 40 else 'warning' if levelno >= 30 else 'info' if levelno >= 20 else 'debug'
+            # prepare() has already replaced msg with the fully formatted line
+            insert_args.extend((record.msg + '\n', tag))
+        
+        if insert_args:
+            self.text_widget.config(state=tk.NORMAL)
+            self.text_widget.insert(tk.END, *insert_args)
+            _trim_text(self.text_widget)
+            self.text_widget.see(tk.END)
+            self.text_widget.config(state=tk.DISABLED)
+        self.text_widget.after(self.FLUSH_INTERVAL_MS, self._flush)
 
 class SpotifyMigratorGUI:
     def __init__(self, root):
@@ -77,6 +88,15 @@ class SpotifyMigratorGUI:
         self.export_manager = None
         self.import_manager = None
         self.erase_manager = None
+        self._manager = None # Shared by all operations; see _get_manager
+        self._manager_settings = None
+        self._manager_lock = threading.Lock()
+        
+        # Background operations run on one long-lived worker instead of a new thread each.
+        # They share one SpotifyManager (and authenticate() replaces its client), so only one runs at a time
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix='spotify-gui')
+        self._current_op: Optional[concurrent.futures.Future] = None
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
         
         # Create the main notebook (tabbed interface)
         self.notebook = ttk.Notebook(root)
@@ -96,12 +116,15 @@ class SpotifyMigratorGUI:
         self.notebook.add(self.erase_tab, text="Erase")
         self.notebook.add(self.logs_tab, text="Logs")
         
-        # Initialize each tab
+        # Initialize the tabs needed at startup; the logs tab must exist before logging is set up.
+        # The others are built the first time they are selected (see on_tab_change)
         self.init_setup_tab()
-        self.init_export_tab()
-        self.init_import_tab()
-        self.init_erase_tab()
         self.init_logs_tab()
+        self._pending_tab_inits = {
+            str(self.export_tab): self.init_export_tab,
+            str(self.import_tab): self.init_import_tab,
+            str(self.erase_tab): self.init_erase_tab,
+        }
         
         # Bind tab change event to update status
         self.notebook.bind("<<NotebookTabChanged>>", self.on_tab_change)
@@ -252,6 +275,12 @@ class SpotifyMigratorGUI:
                                      variable=self.import_selective_var)
         selective_check.grid(row=0, column=0, sticky=tk.W, padx=5, pady=5)
         
+        # Duplicate removal (playlists may intentionally repeat tracks, so this is opt-in)
+        self.import_dedupe_var = tk.BooleanVar()
+        dedupe_check = ttk.Checkbutton(options_frame, text="Remove duplicate tracks from playlists", 
+                                  variable=self.import_dedupe_var)
+        dedupe_check.grid(row=1, column=0, sticky=tk.W, padx=5, pady=5)
+        
         # Clean cache checkbox removed - functionality is automatic
         
         # Import button
@@ -273,6 +302,8 @@ class SpotifyMigratorGUI:
             "specified in the 'Import Username' field.\n\n"
             "The data will be read from the specified Data File path.\n\n"
             "If 'Selective Import' is checked, you will be able to choose which playlists to import.\n\n"
+            "If 'Remove duplicate tracks' is checked, repeated tracks are added to each playlist only once. "
+            "Duplicate liked songs are always skipped.\n\n"
             "Authentication cache is automatically cleaned when switching between usernames."
         )
         info_text.config(state=tk.DISABLED)
@@ -363,19 +394,48 @@ class SpotifyMigratorGUI:
     def toggle_debug(self):
         """Toggle debug mode."""
         setup_logging(debug=self.debug_var.get())
+        # setup_logging replaces all root handlers, so reattach the GUI's
+        logging.getLogger().addHandler(self.log_queue_handler)
         logger.info(f"Debug mode {'enabled' if self.debug_var.get() else 'disabled'}")
 
+    def _operation_running(self) -> bool:
+        """Returns whether a background operation is still running, telling the user if so."""
+        if self._current_op is not None and not self._current_op.done():
+            messagebox.showwarning("Operation in Progress",
+                "Another operation is still running. Please wait for it to finish.")
+            return True
+        return False
+
+    def _run_in_background(self, func: Callable[[], None]):
+        """Submit an operation to the worker pool, keeping its Future as the current operation."""
+        self._current_op = self._executor.submit(func)
+
+    def on_close(self):
+        """Cancel background work, detach the GUI log handler and close the window."""
+        # Pool workers aren't daemon threads, so a running operation would otherwise keep
+        # changing the account after the window is gone; cancelling stops it at its next request
+        with self._manager_lock:
+            if self._manager is not None:
+                self._manager.cancel()
+                self._manager.close()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        logging.getLogger().removeHandler(self.log_queue_handler)
+        self.root.destroy()
+
     def on_tab_change(self, event):
-        """Handle tab change events."""
-        self.root.update_idletasks()
+        """Handle tab change events, building the selected tab's widgets on first visit."""
+        init_tab = self._pending_tab_inits.pop(self.notebook.select(), None)
+        if init_tab:
+            init_tab()
 
     def browse_data_file(self):
         """Open a file dialog to choose the data file location."""
+        initial_dir, initial_file = os.path.split(self.data_file_var.get())
         filename = filedialog.asksaveasfilename(
             defaultextension=".json",
-            filetypes=[("JSON files", "*.json"), ("All files", "*.*")],
-            initialdir=os.path.dirname(self.data_file_var.get()),
-            initialfile=os.path.basename(self.data_file_var.get()),
+            filetypes=[("JSON files", "*.json"), ("Compressed JSON files", "*.json.gz *.json.zst"), ("All files", "*.*")],
+            initialdir=initial_dir,
+            initialfile=initial_file,
             title="Select Data File Location"
         )
         if filename:
@@ -390,8 +450,11 @@ class SpotifyMigratorGUI:
         )
         if filename:
             try:
+                # Copy the widget out in line ranges rather than as one string
+                last_line = int(self.log_text.index('end-1c').split('.')[0])
                 with open(filename, 'w', encoding='utf-8') as f:
-                    f.write(self.log_text.get("1.0", tk.END))
+                    for start in range(1, last_line + 1, SAVE_LOGS_CHUNK_LINES):
+                        f.write(self.log_text.get(f'{start}.0', f'{start + SAVE_LOGS_CHUNK_LINES}.0'))
                 messagebox.showinfo("Success", f"Logs saved to {filename}")
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to save logs: {e}")
@@ -404,18 +467,25 @@ class SpotifyMigratorGUI:
         logger.info("Logs cleared")
 
     def setup_logging(self):
-        """Set up logging to the Text widget."""
+        """
+        Set up logging to the Text widget.
+        
+        Worker threads only put records on the LogHandler's queue, which the Tk
+        main thread drains into the widget. Logging from an export never waits on
+        the Tk widget.
+        """
         # Configure the root logger
         setup_logging(debug=self.debug_var.get())
         
         # Add our custom handler
-        log_handler = LogHandler(self.log_text)
-        log_handler.setLevel(logging.INFO)
-        log_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+        self.log_queue_handler = LogHandler(self.log_text)
+        self.log_queue_handler.setLevel(logging.INFO)
+        self.log_queue_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+        self.log_queue_handler.start()
         
         # Add the handler to the root logger
         root_logger = logging.getLogger()
-        root_logger.addHandler(log_handler)
+        root_logger.addHandler(self.log_queue_handler)
         
         logger.info("GUI logging initialized")
 
@@ -428,33 +498,41 @@ class SpotifyMigratorGUI:
         self.data_file_var.set(config.DATA_FILE or "")
 
     def save_config(self):
-        """Save configuration values to .env file."""
+        """Save changed configuration values to the .env file and apply them."""
         try:
             # Create or update .env file
             dotenv_path = os.path.join(os.path.dirname(__file__), '..', '.env')
             
-            content = f"""CLIENT_ID='{self.client_id_var.get()}'
-CLIENT_SECRET='{self.client_secret_var.get()}'
-REDIRECT_URI='{self.redirect_uri_var.get()}'
-SPOTIFY_USERNAME='{self.username_var.get()}'
-"""
+            settings = {
+                'CLIENT_ID': self.client_id_var.get(),
+                'CLIENT_SECRET': self.client_secret_var.get(),
+                'REDIRECT_URI': self.redirect_uri_var.get(),
+                'SPOTIFY_USERNAME': self.username_var.get(),
+            }
+            if os.path.exists(dotenv_path):
+                changed = {key: value for key, value in settings.items() if value != (getattr(config, key) or "")}
+            else:
+                changed = settings
+            
+            # set_key rewrites just that line and quotes/escapes the value
+            for key, value in changed.items():
+                set_key(dotenv_path, key, value)
             
-            with open(dotenv_path, 'w') as f:
-                f.write(content)
+            # Apply the new values directly rather than reloading the config module
+            config.update_values(**changed)
                 
             logger.info(f"Configuration saved to {dotenv_path}")
             messagebox.showinfo("Success", "Configuration saved successfully.")
             
-            # Reload configuration
-            import importlib
-            importlib.reload(config)
-            
         except Exception as e:
             logger.error(f"Error saving configuration: {e}", exc_info=True)
             messagebox.showerror("Error", f"Failed to save configuration: {e}")
 
     def test_connection(self):
         """Test Spotify API connection."""
+        if self._operation_running():
+            return
+            
         # Check if credentials are filled
         if not self.client_id_var.get() or not self.client_secret_var.get():
             messagebox.showerror("Error", "Client ID and Client Secret are required.")
@@ -463,23 +541,41 @@ SPOTIFY_USERNAME='{self.username_var.get()}'
         # Start progress
         self.set_status("Testing connection...", True)
         
-        # Create a thread for testing
-        thread = threading.Thread(target=self._test_connection_thread)
-        thread.daemon = True
-        thread.start()
+        # Run the connection test on the worker pool
+        self._run_in_background(self._test_connection_thread)
+
+    def _get_manager(self, username: Optional[str] = None):
+        """
+        Returns a SpotifyManager for the current setup values, reusing the last one if they haven't changed.
+        
+        Sharing the manager between test/export/import/erase keeps its pooled HTTP
+        connections, rate limiter and playlist cache warm across operations.
+        spotipy (and requests/urllib3 with it) is imported here rather than at
+        module load, so the window comes up without paying for it.
+        """
+        from .spotify_manager import SpotifyManager
+        settings = (username or self.username_var.get(), self.client_id_var.get(),
+                    self.client_secret_var.get(), self.redirect_uri_var.get())
+        with self._manager_lock:
+            if self._manager is None or self._manager_settings != settings:
+                if self._manager is not None:
+                    self._manager.close()
+                self._manager = SpotifyManager(
+                    username=settings[0],
+                    client_id=settings[1],
+                    client_secret=settings[2],
+                    redirect_uri=settings[3],
+                    scope=config.SPOTIFY_SCOPE
+                )
+                self._manager_settings = settings
+            return self._manager
 
     def _test_connection_thread(self):
         """Run the API connection test in a separate thread."""
         try:
             # Create a test manager for validation
             username = self.username_var.get() or "test_user"
-            manager = SpotifyManager(
-                username=username,
-                client_id=self.client_id_var.get(),
-                client_secret=self.client_secret_var.get(),
-                redirect_uri=self.redirect_uri_var.get(),
-                scope=config.SPOTIFY_SCOPE
-            )
+            manager = self._get_manager(username)
             
             # Try to authenticate
             if manager.authenticate(clean_cache=True):
@@ -508,8 +604,15 @@ SPOTIFY_USERNAME='{self.username_var.get()}'
             self.progress.stop()
         self.root.update_idletasks()
 
+    def show_progress(self, message: str):
+        """Update the status text from a worker thread while an operation is running."""
+        self.root.after(0, lambda: self.status_label.config(text=message))
+
     def start_export(self):
         """Start the export process."""
+        if self._operation_running():
+            return
+            
         # Validate requirements
         if not self.validate_operation_requirements('export'):
             return
@@ -517,22 +620,14 @@ SPOTIFY_USERNAME='{self.username_var.get()}'
         # Start progress
         self.set_status("Exporting data...", True)
         
-        # Create a thread for export
-        thread = threading.Thread(target=self._run_export_thread)
-        thread.daemon = True
-        thread.start()
+        # Run the export on the worker pool
+        self._run_in_background(self._run_export_thread)
 
     def _run_export_thread(self):
         """Run the export process in a separate thread."""
         try:
             # Create the Spotify manager
-            self.export_manager = SpotifyManager(
-                username=self.username_var.get(),
-                client_id=self.client_id_var.get(),
-                client_secret=self.client_secret_var.get(),
-                redirect_uri=self.redirect_uri_var.get(),
-                scope=config.SPOTIFY_SCOPE
-            )
+            self.export_manager = self._get_manager()
             
             # Authenticate - cache cleaning is now automatic based on username changes
             if not self.export_manager.authenticate():
@@ -552,15 +647,15 @@ SPOTIFY_USERNAME='{self.username_var.get()}'
             # Handle selective mode
             selected_playlists = playlists_raw
             if self.export_selective_var.get():
-                # Fetch tracks for selection display first
-                for p in playlists_raw:
-                    logger.info(f"Fetching tracks for playlist: {p.get('name', 'Unnamed Playlist')}")
-                    tracks = self.export_manager.get_playlist_tracks(p['id'])
-                    p['tracks'] = tracks if tracks is not None else []
+                # Fetch tracks for selection display first, concurrently
+                track_lists = list(self.export_manager.iter_tracks_for_playlists(playlists_raw))
+                for p, tracks in zip(playlists_raw, track_lists):
+                    logger.info(f"Fetched {len(tracks)} tracks for playlist: {p.get('name', 'Unnamed Playlist')}")
+                    p['tracks'] = tracks
                 
                 # Show selection dialog
                 self.root.after(0, lambda: self.show_playlist_selection_dialog(
-                    playlists_raw, "select for export", self._continue_export))
+                    playlists_raw, "select for export", self._on_export_selection))
                 return  # Will continue in callback
             else:
                 # Continue with all playlists
@@ -571,7 +666,21 @@ SPOTIFY_USERNAME='{self.username_var.get()}'
             self.root.after(0, lambda: messagebox.showerror("Error", f"Export failed: {str(e)}"))
             self.root.after(0, lambda: self.set_status("Ready", False))
 
-    def _continue_export(self, selected_playlists):
+    def _on_export_selection(self, selected_playlists):
+        """Handle the export selection dialog's result on the Tk thread, then resume the export in the background."""
+        if not selected_playlists:
+            logger.info("No playlists selected for export")
+            self.set_status("Ready", False)
+            return
+        
+        # Handle liked songs - decided up front since the file is written as data arrives
+        export_liked = messagebox.askyesno("Export Liked Songs", 
+            "Do you want to export liked songs as well?")
+        
+        # Run the rest on the worker pool so the status bar can show progress meanwhile
+        self._run_in_background(lambda: self._continue_export(selected_playlists, export_liked))
+
+    def _continue_export(self, selected_playlists, export_liked: bool = True):
         """Continue the export process after playlist selection."""
         try:
             if not selected_playlists:
@@ -579,69 +688,62 @@ SPOTIFY_USERNAME='{self.username_var.get()}'
                 self.root.after(0, lambda: self.set_status("Ready", False))
                 return
                 
-            # Process selected playlists for export
-            playlist_data = []
-            for p in selected_playlists:
-                playlist_name = p.get('name', 'Unnamed Playlist')
-                logger.info(f"Processing playlist: {playlist_name}")
-                
-                # If tracks weren't already fetched during selection
-                if 'tracks' not in p or not self.export_selective_var.get():
-                    tracks = self.export_manager.get_playlist_tracks(p['id'])
-                    if tracks is None:
-                        logger.warning(f"Failed to fetch tracks for {playlist_name}. Skipping tracks.")
-                        tracks = []
-                else:
-                    tracks = p['tracks']
-                
-                # Extract and log image information
-                images = p.get('images', [])
-                if images:
-                    logger.info(f"Found {len(images)} image(s) for playlist '{playlist_name}'")
-                    for i, img in enumerate(images):
-                        size = f"{img.get('width', '?')}x{img.get('height', '?')}"
-                        logger.debug(f"  Image {i+1}: {size} - {img.get('url', 'No URL')}")
-                else:
-                    logger.info(f"No images found for playlist '{playlist_name}'")
-                    
-                playlist_data.append({
-                    'id': p['id'],
-                    'name': playlist_name,
-                    'public': p.get('public', False),
-                    'description': p.get('description', ''),
-                    'images': images,
-                    'tracks': tracks
-                })
-                
-            # Handle liked songs
-            liked_songs = []
-            export_liked = True
+            selective = self.export_selective_var.get()
             
-            if self.export_selective_var.get():
-                # Show dialog to ask about liked songs
-                msg_result = messagebox.askyesno("Export Liked Songs", 
-                    "Do you want to export liked songs as well?")
-                export_liked = msg_result
-                
-            if export_liked:
-                logger.info("Fetching liked songs...")
-                liked_songs = self.export_manager.get_liked_songs()
-                if liked_songs is None:
-                    logger.error("Failed to fetch liked songs")
-                    liked_songs = []
-            else:
+            if not export_liked:
                 logger.info("Skipping liked songs export as per user selection")
-                
-            # Prepare export content
-            export_content = {'playlists': playlist_data, 'liked_songs': liked_songs}
             
-            # Save to file
+            # Fetch tracks for every playlist that wasn't already fetched during selection, all at once
+            pending = [p for p in selected_playlists if 'tracks' not in p or not selective]
+            
+            def playlist_entries():
+                """Yield each playlist's export entry as soon as its tracks arrive."""
+                fetched_tracks = self.export_manager.iter_tracks_for_playlists(pending)
+                total = len(selected_playlists)
+                for i, p in enumerate(selected_playlists, 1):
+                    playlist_name = p.get('name', 'Unnamed Playlist')
+                    logger.info(f"Processing playlist: {playlist_name}")
+                    self.show_progress(f"Exporting playlist {i}/{total}...")
+                    if 'tracks' not in p or not selective:
+                        tracks = next(fetched_tracks)
+                    else:
+                        tracks = p['tracks']
+                    
+                    # Extract and log image information
+                    images = p.get('images', [])
+                    if images:
+                        logger.info(f"Found {len(images)} image(s) for playlist '{playlist_name}'")
+                        if logger.isEnabledFor(logging.DEBUG):
+                            for img_number, img in enumerate(images, 1):
+                                logger.debug("  Image %d: %sx%s - %s", img_number, img.get('width', '?'),
+                                             img.get('height', '?'), img.get('url', 'No URL'))
+                    else:
+                        logger.info(f"No images found for playlist '{playlist_name}'")
+                        
+                    yield {
+                        'id': p['id'],
+                        'snapshot_id': p.get('snapshot_id'),
+                        'name': playlist_name,
+                        'public': p.get('public', False),
+                        'description': p.get('description', ''),
+                        'images': images,
+                        'tracks': tracks
+                    }
+            
+            def liked_song_uris():
+                """Yield liked song URIs once all playlists have been written."""
+                if export_liked:
+                    self.show_progress("Exporting liked songs...")
+                    yield from self.export_manager.iter_liked_songs()
+            
+            # Stream to file
             try:
-                save_data(export_content, self.data_file_var.get())
+                playlist_count, liked_count = save_data_stream(
+                    playlist_entries(), liked_song_uris(), self.data_file_var.get())
                 logger.info(f"Export completed successfully")
                 self.root.after(0, lambda: messagebox.showinfo("Success", 
                     f"Export completed successfully!\n\n"
-                    f"Exported {len(playlist_data)} playlists and {len(liked_songs)} liked songs."))
+                    f"Exported {playlist_count} playlists and {liked_count} liked songs."))
             except Exception as e:
                 logger.error(f"Failed to save exported data: {e}", exc_info=True)
                 self.root.after(0, lambda: messagebox.showerror("Error", 
@@ -655,6 +757,9 @@ SPOTIFY_USERNAME='{self.username_var.get()}'
 
     def start_import(self):
         """Start the import process."""
+        if self._operation_running():
+            return
+            
         # Validate requirements
         if not self.validate_operation_requirements('import'):
             return
@@ -667,10 +772,8 @@ SPOTIFY_USERNAME='{self.username_var.get()}'
         # Start progress
         self.set_status("Importing data...", True)
         
-        # Create a thread for import
-        thread = threading.Thread(target=self._run_import_thread)
-        thread.daemon = True
-        thread.start()
+        # Run the import on the worker pool
+        self._run_in_background(self._run_import_thread)
 
     def _run_import_thread(self):
         """Run the import process in a separate thread."""
@@ -684,15 +787,10 @@ SPOTIFY_USERNAME='{self.username_var.get()}'
                 return
             
             # Create the Spotify manager
-            self.import_manager = SpotifyManager(
-                username=self.username_var.get(),
-                client_id=self.client_id_var.get(),
-                client_secret=self.client_secret_var.get(),
-                redirect_uri=self.redirect_uri_var.get(),
-                scope=config.SPOTIFY_SCOPE
-            )
+            self.import_manager = self._get_manager()
             
             # Authenticate - cache cleaning is now automatic based on username changes
+            # On failure the parsed file stays cached, so retrying with fixed credentials skips the parse
             if not self.import_manager.authenticate():
                 logger.error("Authentication failed for import")
                 self.root.after(0, lambda: messagebox.showerror("Error", 
@@ -716,6 +814,7 @@ SPOTIFY_USERNAME='{self.username_var.get()}'
                 self._continue_import([], data_to_import)
         
         except Exception as e:
+            clear_load_cache()
             logger.error(f"Error in import process: {e}", exc_info=True)
             self.root.after(0, lambda: messagebox.showerror("Error", f"Import failed: {str(e)}"))
             self.root.after(0, lambda: self.set_status("Ready", False))
@@ -741,15 +840,15 @@ SPOTIFY_USERNAME='{self.username_var.get()}'
                 logger.warning("No liked songs found in data file")
             
             # Import selected playlists
+            remove_duplicates = self.import_dedupe_var.get()
             if selected_playlists:
                 logger.info(f"Importing {len(selected_playlists)} playlists...")
+                valid_playlists = []
                 for i, playlist in enumerate(selected_playlists, 1):
                     playlist_name = playlist.get('name', f'Imported Playlist {i}')
-                    is_public = playlist.get('public', False)
-                    track_uris = playlist.get('tracks', [])
                     images = playlist.get('images', [])
                     
-                    if not isinstance(track_uris, list):
+                    if not isinstance(playlist.get('tracks', []), list):
                         logger.warning(f"Skipping playlist '{playlist_name}' due to invalid tracks format")
                         continue
                     
@@ -758,13 +857,16 @@ SPOTIFY_USERNAME='{self.username_var.get()}'
                         logger.info(f"Playlist '{playlist_name}' has {len(images)} image(s) - attempting to import cover image")
                     else:
                         logger.info(f"Playlist '{playlist_name}' has no images")
+                    valid_playlists.append(dict(playlist, name=playlist_name))
                         
-                    self.import_manager.create_playlist_and_add_tracks(playlist_name, is_public, track_uris, images)
+                imported_count = self.import_manager.import_playlists(valid_playlists, remove_duplicates=remove_duplicates)
+            else:
+                imported_count = 0
             
             # Show success message
             self.root.after(0, lambda: messagebox.showinfo("Success", 
                 f"Import completed successfully!\n\n"
-                f"Imported {len(selected_playlists)} playlists"
+                f"Imported {imported_count} playlists"
                 f"{' and liked songs' if import_liked and 'liked_songs' in data_to_import and data_to_import['liked_songs'] else ''}."))
                 
             logger.info("Import completed successfully")
@@ -773,10 +875,15 @@ SPOTIFY_USERNAME='{self.username_var.get()}'
             logger.error(f"Error in import process: {e}", exc_info=True)
             self.root.after(0, lambda: messagebox.showerror("Error", f"Import failed: {str(e)}"))
         finally:
+            # The import is done with the file; don't keep it in memory for the rest of the session
+            clear_load_cache()
             self.root.after(0, lambda: self.set_status("Ready", False))
 
     def start_erase(self):
         """Start the erase process."""
+        if self._operation_running():
+            return
+            
         # Validate requirements
         if not self.validate_operation_requirements('erase'):
             return
@@ -800,22 +907,14 @@ SPOTIFY_USERNAME='{self.username_var.get()}'
         # Start progress
         self.set_status("Erasing data...", True)
         
-        # Create a thread for erase
-        thread = threading.Thread(target=self._run_erase_thread)
-        thread.daemon = True
-        thread.start()
+        # Run the erase on the worker pool
+        self._run_in_background(self._run_erase_thread)
 
     def _run_erase_thread(self):
         """Run the erase process in a separate thread."""
         try:
             # Create the Spotify manager
-            self.erase_manager = SpotifyManager(
-                username=self.username_var.get(),
-                client_id=self.client_id_var.get(),
-                client_secret=self.client_secret_var.get(),
-                redirect_uri=self.redirect_uri_var.get(),
-                scope=config.SPOTIFY_SCOPE
-            )
+            self.erase_manager = self._get_manager()
             
             # Authenticate - cache cleaning is now automatic based on username changes
             if not self.erase_manager.authenticate():
@@ -882,10 +981,7 @@ SPOTIFY_USERNAME='{self.username_var.get()}'
         if confirm:
             try:
                 # Delete playlists
-                for i, playlist in enumerate(playlists, 1):
-                    playlist_name = playlist.get('name', 'Unnamed Playlist')
-                    logger.warning(f"Deleting playlist {i}/{len(playlists)}: '{playlist_name}'")
-                    self.erase_manager.unfollow_playlist(playlist['id'])
+                self.erase_manager.unfollow_playlists(playlists)
                 
                 logger.info("Finished deleting playlists")
                 # Continue with liked songs
@@ -0,0 +1,79 @@
+import json
+import time
+import sqlite3
+import logging
+import threading
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+class PlaylistCache:
+    """
+    Disk-backed cache of playlist track URIs, stored in SQLite.
+
+    Entries are keyed by playlist ID and only served while the playlist's
+    snapshot_id is unchanged (Spotify assigns a new one on every edit) and the
+    entry is younger than the TTL. The connection is opened on first use and
+    shared between threads behind a lock. Cache errors are logged and treated
+    as misses so they never interrupt an export.
+    """
+
+    def __init__(self, db_path: str, ttl: float):
+        self.db_path = db_path
+        self.ttl = ttl
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Opens the database and creates the table if needed. Caller must hold the lock."""
+        if self._conn is None:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS playlist_tracks ("
+                "playlist_id TEXT PRIMARY KEY, "
+                "snapshot_id TEXT NOT NULL, "
+                "tracks_json BLOB NOT NULL, "
+                "fetched_at INTEGER NOT NULL)"
+            )
+            conn.commit()
+            self._conn = conn
+            logger.debug("Opened playlist cache: %s", self.db_path)
+        return self._conn
+
+    def get(self, playlist_id: str, snapshot_id: str) -> Optional[List[str]]:
+        """Returns the cached track URIs for a playlist, or None if missing, stale or expired."""
+        try:
+            with self._lock:
+                row = self._connect().execute(
+                    "SELECT tracks_json, fetched_at FROM playlist_tracks WHERE playlist_id = ? AND snapshot_id = ?",
+                    (playlist_id, snapshot_id)
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Error reading playlist cache {self.db_path}: {e}")
+            return None
+
+        if row is None or time.time() - row[1] >= self.ttl:
+            return None
+        return json.loads(row[0])
+
+    def put(self, playlist_id: str, snapshot_id: str, track_uris: List[str]):
+        """Stores the track URIs for a playlist at the given snapshot, replacing any older entry."""
+        tracks_json = json.dumps(track_uris, separators=(',', ':'))
+        try:
+            with self._lock:
+                conn = self._connect()
+                conn.execute(
+                    "INSERT OR REPLACE INTO playlist_tracks (playlist_id, snapshot_id, tracks_json, fetched_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    (playlist_id, snapshot_id, tracks_json, int(time.time()))
+                )
+                conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Error writing playlist cache {self.db_path}: {e}")
+
+    def close(self):
+        """Closes the database connection if it was opened."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
\ No newline at end of file
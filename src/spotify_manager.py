@@ -2,28 +2,141 @@ import os
 import time
 import logging
 import base64
-from typing import List, Dict, Any, Callable, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Callable, Iterator, Optional
 
 import spotipy
 from spotipy.oauth2 import SpotifyOAuth
+from spotipy.cache_handler import CacheFileHandler
 from spotipy.exceptions import SpotifyException
 import requests # For potential network errors
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from . import config # Use relative import within the package
+from .playlist_cache import PlaylistCache
 
 logger = logging.getLogger(__name__)
 
+# Debug messages on per-page/per-batch paths use %-style arguments so they are
+# only formatted when DEBUG logging is actually enabled.
+
 # --- Constants ---
 RATE_LIMIT_STATUS = 429
 MAX_RETRIES = 3
 INITIAL_RETRY_DELAY = 1 # seconds
 MAX_TRACKS_PER_ADD = 100 # For adding tracks to playlist
 MAX_TRACKS_PER_LIKE_DELETE = 50 # For liking/unliking tracks
+PAGE_SIZE = 50 # Items requested per page when paginating (API maximum for playlists and saved tracks)
+PLAYLIST_ITEMS_PAGE_SIZE = 100 # API maximum for playlist items
+MAX_CONCURRENT_REQUESTS = 8 # Upper bound on in-flight API requests per manager
+MAX_REQUESTS_PER_SECOND = 10 # Sustained API request rate; bursts of up to MAX_CONCURRENT_REQUESTS are allowed
+MAX_WRITE_WORKERS = 2 # Concurrent requests for order-insensitive writes (Liked Songs, playlist deletion)
+SERVER_ERROR_STATUSES = (500, 502, 503, 504) # Retried by the HTTP adapter; 429 is handled in _spotify_api_call
 
 # Track the last authenticated username across instances
 # This helps detect when a user switches accounts
 _last_authenticated_username = None
 
+def _create_session() -> requests.Session:
+    """Creates a keep-alive HTTP session sized for concurrent API calls."""
+    retry = Retry(
+        total=MAX_RETRIES,
+        backoff_factor=0.3,
+        status_forcelist=SERVER_ERROR_STATUSES,
+        allowed_methods=frozenset(['GET', 'POST', 'PUT', 'DELETE'])
+    )
+    adapter = HTTPAdapter(pool_connections=MAX_CONCURRENT_REQUESTS,
+                          pool_maxsize=MAX_CONCURRENT_REQUESTS,
+                          max_retries=retry)
+    session = requests.Session()
+    session.mount('https://', adapter)
+    return session
+
+def reported_track_count(playlist: Dict[str, Any]) -> Optional[int]:
+    """Returns the track total included in a playlist listing object, if present."""
+    tracks = playlist.get('tracks')
+    if isinstance(tracks, dict):
+        return tracks.get('total')
+    return None
+
+class OperationCancelled(BaseException):
+    """
+    Raised by API calls made after SpotifyManager.cancel().
+    
+    Like KeyboardInterrupt it derives from BaseException, so the per-playlist and
+    per-batch `except Exception` handlers let it through instead of moving on to
+    the next playlist or batch.
+    """
+
+class _RequestRateLimiter:
+    """
+    Token bucket that paces API requests across threads.
+    
+    Spotify only answers with 429 after the limit is exceeded, which wastes the
+    rejected round trip and then stalls for Retry-After. Spacing requests out up
+    front keeps parallel fetches under the limit instead.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        """Adds the tokens accrued since the last update. Caller must hold the lock."""
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self):
+        """Blocks until the next request may be sent."""
+        with self._lock:
+            self._refill()
+            # Reserve a token even if it takes the balance negative, then sleep off
+            # the debt outside the lock so waiting threads queue up in order
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0
+        if wait:
+            time.sleep(wait)
+
+    def defer(self, seconds: float):
+        """Holds back all requests for the given time, e.g. after a 429 with Retry-After."""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self._tokens, 0) - seconds * self.rate
+
+class _MemoryBackedCacheFileHandler(CacheFileHandler):
+    """
+    Token cache that reads the cache file once and then serves the token from memory.
+    
+    spotipy asks its cache handler for the token before every API request, and the
+    stock file handler re-reads and re-parses the cache file each time. Refreshed
+    tokens are still written through to disk so they survive restarts.
+    """
+
+    def __init__(self, cache_path: str):
+        super().__init__(cache_path=cache_path)
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._token_info: Optional[Dict[str, Any]] = None
+
+    def get_cached_token(self) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            if not self._loaded:
+                self._token_info = super().get_cached_token()
+                self._loaded = True
+            return self._token_info
+
+    def save_token_to_cache(self, token_info: Dict[str, Any]):
+        with self._lock:
+            self._token_info = token_info
+            self._loaded = True
+        super().save_token_to_cache(token_info)
+
 class SpotifyManager:
     """Manages authentication and interactions with the Spotify API."""
 
@@ -37,6 +150,15 @@ class SpotifyManager:
         self.scope = scope
         self.sp: Optional[spotipy.Spotify] = None
         self.user_id: Optional[str] = None
+        # Shared by the API client, the auth manager and image downloads so TCP/TLS connections are reused
+        self.session = _create_session()
+        # Bounds concurrent API calls so parallel fetches stay under the rate limit
+        self._request_slots = threading.BoundedSemaphore(MAX_CONCURRENT_REQUESTS)
+        self._rate_limiter = _RequestRateLimiter(MAX_REQUESTS_PER_SECOND, MAX_CONCURRENT_REQUESTS)
+        # Set by cancel(); checked before every API request
+        self._cancelled = threading.Event()
+        # Track lists of unchanged playlists are reused across exports
+        self.playlist_cache = PlaylistCache(config.PLAYLIST_CACHE_FILE, config.PLAYLIST_CACHE_TTL)
 
     def _should_clean_cache(self) -> bool:
         """Determines if cache should be cleaned based on username changes."""
@@ -92,11 +214,11 @@ class SpotifyManager:
                 client_secret=self.client_secret,
                 redirect_uri=self.redirect_uri,
                 scope=self.scope,
-                username=self.username,
-                cache_path=cache_path, # Explicitly set cache path
-                open_browser=True # Allow opening browser for first auth
+                cache_handler=_MemoryBackedCacheFileHandler(cache_path), # Explicitly set cache path
+                open_browser=True, # Allow opening browser for first auth
+                requests_session=self.session
             )
-            self.sp = spotipy.Spotify(auth_manager=auth_manager)
+            self.sp = spotipy.Spotify(auth_manager=auth_manager, requests_session=self.session)
             
             # Verify authentication and get user ID
             me = self.sp.me()
@@ -151,6 +273,20 @@ class SpotifyManager:
                  logger.warning(f"Could not retrieve authorization URL: {url_err}")
 
 
+    def close(self):
+        """Closes the playlist cache's database connection; it is reopened if the manager is used again."""
+        self.playlist_cache.close()
+
+    def cancel(self):
+        """
+        Stops this manager from sending further API requests.
+        
+        Every request (each playlist creation, track batch, Liked Songs batch and
+        page fetch) checks for this first, so a running operation raises
+        OperationCancelled at its next request rather than running to completion.
+        """
+        self._cancelled.set()
+
     def _spotify_api_call(self, api_func: Callable, *args, **kwargs) -> Optional[Any]:
         """Wrapper for Spotify API calls with retry logic for rate limiting."""
         if not self.sp:
@@ -160,17 +296,24 @@ class SpotifyManager:
         retries = 0
         delay = INITIAL_RETRY_DELAY
         while retries <= MAX_RETRIES:
+            self._rate_limiter.acquire()
+            if self._cancelled.is_set():
+                raise OperationCancelled(f"Cancelled before calling {api_func.__name__}")
             try:
-                return api_func(*args, **kwargs)
+                with self._request_slots:
+                    return api_func(*args, **kwargs)
+            # API and network errors carry their cause in the message; the stack trace is
+            # only formatted (and pushed through the GUI log) when debugging
             except SpotifyException as e:
                 if e.http_status == RATE_LIMIT_STATUS and retries < MAX_RETRIES:
                     retry_after = int(e.headers.get('Retry-After', delay)) # Use header if available
                     logger.warning(f"Rate limit hit (429). Retrying in {retry_after} seconds... ({retries + 1}/{MAX_RETRIES})")
-                    time.sleep(retry_after)
+                    # Hold back the other threads too; the retry's own acquire() sleeps off the wait
+                    self._rate_limiter.defer(retry_after)
                     retries += 1
                     delay = retry_after # Use the server-suggested delay for next potential retry
                 else:
-                    logger.error(f"Spotify API error calling {api_func.__name__}: {e.http_status} - {e.msg}", exc_info=True)
+                    logger.error(f"Spotify API error calling {api_func.__name__}: {e.http_status} - {e.msg}", exc_info=logger.isEnabledFor(logging.DEBUG))
                     return None # Indicate failure
             except requests.exceptions.Timeout:
                 logger.warning(f"Request timed out calling {api_func.__name__}. Retrying... ({retries + 1}/{MAX_RETRIES})")
@@ -178,7 +321,7 @@ class SpotifyManager:
                 retries += 1
                 delay *= 2 # Exponential backoff for timeouts
             except requests.exceptions.RequestException as e:
-                logger.error(f"Network error calling {api_func.__name__}: {e}", exc_info=True)
+                logger.error(f"Network error calling {api_func.__name__}: {e}", exc_info=logger.isEnabledFor(logging.DEBUG))
                 return None # Indicate failure
             except Exception as e:
                  logger.error(f"Unexpected error calling {api_func.__name__}: {e}", exc_info=True)
@@ -188,158 +331,345 @@ class SpotifyManager:
         return None
 
 
-    def _fetch_paginated_data(self, fetch_func: Callable, *args, **kwargs) -> List[Dict[str, Any]]:
+    def _iter_paginated_data(self, fetch_func: Callable, *args, page_size: int = PAGE_SIZE, **kwargs) -> Iterator[Dict[str, Any]]:
         """
-        Fetches all items from a paginated Spotify endpoint.
+        Yields all items from a paginated Spotify endpoint.
+        
+        The first page is requested on its own to learn the total item count;
+        the remaining pages are then requested concurrently by offset. Endpoints
+        that do not report a total are followed serially via their 'next' links.
+        Items are yielded page by page, so callers can process them without
+        materializing the whole result set.
         
         Args:
-            fetch_func: The Spotify API function to call
+            fetch_func: The Spotify API function to call (must accept limit/offset)
             *args: Positional arguments to pass to the function
+            page_size: Items to request per page; use the endpoint's maximum to minimize round trips
             **kwargs: Keyword arguments to pass to the function
         
-        Returns:
-            List of items from all pages
+        Yields:
+            Items from all pages, in API order
         """
-        items = []
         if not self.sp:
             logger.error("Spotify client not authenticated.")
-            return items
+            return
 
-        logger.debug(f"Fetching paginated data using {fetch_func.__name__} with args: {args} and kwargs: {kwargs}")
-        results = self._spotify_api_call(fetch_func, *args, **kwargs)
-        
-        page_count = 0
-        while results:
-            page_count += 1
-            items.extend(results['items'])
-            logger.debug(f"Fetched page {page_count}, total items so far: {len(items)}")
-            if results['next']:
-                results = self._spotify_api_call(self.sp.next, results)
-            else:
-                results = None  # End of pagination
+        logger.debug("Fetching paginated data using %s with args: %s and kwargs: %s", fetch_func.__name__, args, kwargs)
+        results = self._spotify_api_call(fetch_func, *args, limit=page_size, offset=0, **kwargs)
+        if not results:
+            return
+
+        item_count = len(results['items'])
+        total = results.get('total')
+
+        if total is None:
+            # No total reported - fall back to following the 'next' links. Each next page
+            # is requested before the current one is handed to the caller, so the
+            # network wait overlaps with the caller's processing.
+            page_count = 1
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                while results:
+                    next_page = executor.submit(self._spotify_api_call, self.sp.next, results) if results.get('next') else None
+                    yield from results['items']
+                    results = next_page.result() if next_page else None
+                    if results:
+                        page_count += 1
+                        item_count += len(results['items'])
+                        logger.debug("Fetched page %d, total items so far: %d", page_count, item_count)
+        else:
+            yield from results['items']
+            # Use the limit the API actually applied, in case it capped our request
+            page_size = results.get('limit') or page_size
+            offsets = range(page_size, total, page_size)
+            if offsets:
+                logger.debug("Fetching %d remaining pages concurrently (%d items total)", len(offsets), total)
+
+                def fetch_page(offset: int) -> Optional[Dict[str, Any]]:
+                    return self._spotify_api_call(fetch_func, *args, limit=page_size, offset=offset, **kwargs)
+
+                with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS) as executor:
+                    # map() yields pages in offset order, preserving item order
+                    for offset, page in zip(offsets, executor.map(fetch_page, offsets)):
+                        if page is None:
+                            logger.error(f"Failed to fetch page at offset {offset} using {fetch_func.__name__}")
+                            continue
+                        item_count += len(page['items'])
+                        yield from page['items']
         
-        logger.debug(f"Finished fetching paginated data. Total items: {len(items)}")
-        return items
+        logger.debug("Finished fetching paginated data. Total items: %d", item_count)
 
     def get_all_playlists(self) -> List[Dict[str, Any]]:
         """Fetches all playlists for the current user."""
         logger.info("Fetching user playlists...")
-        playlists = self._fetch_paginated_data(self.sp.current_user_playlists)
+        # The listing can contain null or partial entries; drop them as pages arrive
+        # rather than in a second pass, since every caller indexes playlist['id']
+        playlists = [p for p in self._iter_paginated_data(self.sp.current_user_playlists)
+                     if isinstance(p, dict) and p.get('id')]
         logger.info(f"Found {len(playlists)} playlists.")
         return playlists
 
-    def get_playlist_tracks(self, playlist_id: str) -> List[str]:
-        """Fetches all track URIs for a given playlist ID."""
-        logger.debug(f"Fetching tracks for playlist ID: {playlist_id}")
-        tracks = self._fetch_paginated_data(self.sp.playlist_items, playlist_id, fields='items(track(uri)),next')
+    def get_playlist_tracks(self, playlist_id: str, track_count: Optional[int] = None,
+                            snapshot_id: Optional[str] = None) -> List[str]:
+        """
+        Fetches all track URIs for a given playlist ID.
+        
+        Track lists are served from the playlist cache while the playlist's
+        snapshot_id is unchanged; only complete fetches are cached.
+        
+        Args:
+            playlist_id: The Spotify ID of the playlist
+            track_count: Track total already reported by the playlists endpoint, if known;
+                a known-empty playlist is answered without an API call
+            snapshot_id: Snapshot ID already reported by the playlists endpoint, if known;
+                without it the cache is bypassed
+        """
+        if track_count == 0:
+            logger.debug("Playlist ID %s is empty - skipping track fetch", playlist_id)
+            return []
+
+        if snapshot_id:
+            cached_uris = self.playlist_cache.get(playlist_id, snapshot_id)
+            if cached_uris is not None:
+                logger.debug("Using %d cached tracks for playlist ID: %s", len(cached_uris), playlist_id)
+                return cached_uris
+
+        logger.debug("Fetching tracks for playlist ID: %s", playlist_id)
+        tracks = list(self._iter_paginated_data(self.sp.playlist_items, playlist_id, page_size=PLAYLIST_ITEMS_PAGE_SIZE,
+                                                fields='items(track(uri)),next,total'))
         # Filter out potential null tracks or tracks without URI (e.g., local files not synced)
         track_uris = [item['track']['uri'] for item in tracks if item.get('track') and item['track'].get('uri')]
-        logger.debug(f"Found {len(track_uris)} valid tracks for playlist ID: {playlist_id}")
+        logger.debug("Found %d valid tracks for playlist ID: %s", len(track_uris), playlist_id)
+
+        # A failed page leaves the list short of the reported total; don't cache that
+        if snapshot_id and track_count is not None and len(tracks) == track_count:
+            self.playlist_cache.put(playlist_id, snapshot_id, track_uris)
         return track_uris
 
+    def iter_tracks_for_playlists(self, playlists: List[Dict[str, Any]]) -> Iterator[List[str]]:
+        """
+        Fetches track URIs for several playlists concurrently.
+        
+        Takes playlist objects as returned by get_all_playlists so their reported
+        track totals and snapshot IDs can be used to skip empty playlists and
+        serve unchanged ones from the cache without extra requests. Track lists are yielded
+        in the order given, each as soon as it (and every one before it) has
+        arrived, so callers can process early playlists while later ones are
+        still being fetched.
+        """
+        if not playlists:
+            return
+        logger.info(f"Fetching tracks for {len(playlists)} playlists...")
+
+        def fetch_tracks(playlist: Dict[str, Any]) -> List[str]:
+            return self.get_playlist_tracks(playlist['id'], reported_track_count(playlist), playlist.get('snapshot_id'))
+
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS) as executor:
+            yield from executor.map(fetch_tracks, playlists)
+
+    def iter_liked_songs(self) -> Iterator[str]:
+        """Yields liked song URIs for the current user page by page, without collecting them first."""
+        logger.info("Fetching liked songs...")
+        for item in self._iter_paginated_data(self.sp.current_user_saved_tracks):
+            # Filter out potential null tracks or tracks without URI
+            track = item.get('track')
+            if track and track.get('uri'):
+                yield track['uri']
+
     def get_liked_songs(self) -> List[str]:
         """Fetches all liked song URIs for the current user."""
-        logger.info("Fetching liked songs...")
-        liked_items = self._fetch_paginated_data(self.sp.current_user_saved_tracks)
-        # Filter out potential null tracks or tracks without URI
-        liked_uris = [item['track']['uri'] for item in liked_items if item.get('track') and item['track'].get('uri')]
+        liked_uris = list(self.iter_liked_songs())
         logger.info(f"Found {len(liked_uris)} liked songs.")
         return liked_uris
 
+    def _send_library_batches(self, api_func: Callable, track_uris: List[str], action: str):
+        """
+        Sends Liked Songs batches concurrently.
+        
+        Saving/removing library tracks is idempotent and order-insensitive, so
+        batches don't need to wait on each other.
+        """
+        batches = [track_uris[i:i + MAX_TRACKS_PER_LIKE_DELETE]
+                   for i in range(0, len(track_uris), MAX_TRACKS_PER_LIKE_DELETE)]
+
+        def send_batch(batch_number: int, batch: List[str]):
+            logger.debug("Sending batch %d of liked songs to %s (%d tracks)", batch_number, action, len(batch))
+            result = self._spotify_api_call(api_func, tracks=batch)
+            if result is None:
+                 logger.error(f"Failed to {action} batch {batch_number} of liked songs.")
+
+        with ThreadPoolExecutor(max_workers=MAX_WRITE_WORKERS) as executor:
+            list(executor.map(send_batch, range(1, len(batches) + 1), batches))
+
     def add_tracks_to_library(self, track_uris: List[str]):
-        """Adds tracks to the user's library (Liked Songs) in batches."""
+        """Adds tracks to the user's library (Liked Songs) in concurrent batches."""
         if not self.sp: return
         if not track_uris:
             logger.info("No liked songs to import.")
             return
 
+        # Saving is idempotent, so duplicates would only cost extra requests
+        unique_uris = list(dict.fromkeys(track_uris))
+        if len(unique_uris) < len(track_uris):
+            logger.info(f"Skipping {len(track_uris) - len(unique_uris)} duplicate liked songs")
+        track_uris = unique_uris
+
         logger.info(f"Adding {len(track_uris)} tracks to Liked Songs...")
-        for i in range(0, len(track_uris), MAX_TRACKS_PER_LIKE_DELETE):
-            batch = track_uris[i:i + MAX_TRACKS_PER_LIKE_DELETE]
-            logger.debug(f"Adding batch {i // MAX_TRACKS_PER_LIKE_DELETE + 1} of liked songs ({len(batch)} tracks)")
-            result = self._spotify_api_call(self.sp.current_user_saved_tracks_add, tracks=batch)
-            if result is None:
-                 logger.error(f"Failed to add batch {i // MAX_TRACKS_PER_LIKE_DELETE + 1} of liked songs.")
-                 # Optionally: Decide whether to continue or stop on failure
+        self._send_library_batches(self.sp.current_user_saved_tracks_add, track_uris, "add")
         logger.info("Finished adding tracks to Liked Songs.")
 
 
-    def create_playlist_and_add_tracks(self, name: str, public: bool, track_uris: List[str], images: Optional[List[Dict[str, Any]]] = None):
-        """Creates a new playlist and adds tracks to it in batches. Optionally sets playlist cover image."""
-        if not self.sp or not self.user_id:
-            logger.error("Cannot create playlist: Spotify client not authenticated or user ID not found.")
-            return
-
+    def _create_playlist(self, name: str, public: bool) -> Optional[str]:
+        """Creates an empty playlist and returns its ID, or None on failure."""
         logger.info(f"Creating playlist: '{name}' (Public: {public})")
-        try:
-            new_playlist = self._spotify_api_call(self.sp.user_playlist_create, 
-                                                  user=self.user_id, 
-                                                  name=name, 
-                                                  public=public)
-            if not new_playlist or 'id' not in new_playlist:
-                logger.error(f"Failed to create playlist '{name}'. API did not return expected data.")
-                return # Stop if playlist creation failed
-
-            new_playlist_id = new_playlist['id']
-            logger.info(f"Playlist '{name}' created successfully with ID: {new_playlist_id}")
-
-            # Try to set playlist cover image if provided
-            if images and isinstance(images, list) and len(images) > 0:
-                # Use the first (usually highest quality) image
-                image_url = images[0].get('url')
-                if image_url:
-                    logger.info(f"Attempting to set cover image for playlist '{name}'")
-                    success = self.upload_playlist_cover_image(new_playlist_id, image_url)
-                    if success:
-                        logger.info(f"Successfully set cover image for playlist '{name}'")
-                    else:
-                        logger.warning(f"Failed to set cover image for playlist '{name}' - continuing without image")
+        new_playlist = self._spotify_api_call(self.sp.user_playlist_create, 
+                                              user=self.user_id, 
+                                              name=name, 
+                                              public=public)
+        if not new_playlist or 'id' not in new_playlist:
+            logger.error(f"Failed to create playlist '{name}'. API did not return expected data.")
+            return None
+
+        logger.info(f"Playlist '{name}' created successfully with ID: {new_playlist['id']}")
+        return new_playlist['id']
+
+    def _populate_playlist(self, playlist_id: str, name: str, track_uris: List[str], images: Optional[List[Dict[str, Any]]] = None,
+                           remove_duplicates: bool = False):
+        """Sets the cover image of a newly created playlist and adds its tracks in order."""
+        # Try to set playlist cover image if provided
+        if images and isinstance(images, list) and len(images) > 0:
+            # Use the first (usually highest quality) image
+            image_url = images[0].get('url')
+            if image_url:
+                logger.info(f"Attempting to set cover image for playlist '{name}'")
+                success = self.upload_playlist_cover_image(playlist_id, image_url)
+                if success:
+                    logger.info(f"Successfully set cover image for playlist '{name}'")
                 else:
-                    logger.warning(f"No valid image URL found in playlist '{name}' image data")
+                    logger.warning(f"Failed to set cover image for playlist '{name}' - continuing without image")
+            else:
+                logger.warning(f"No valid image URL found in playlist '{name}' image data")
+
+        if not track_uris:
+            logger.info(f"No tracks to add to playlist '{name}'.")
+            return
 
-            if not track_uris:
-                logger.info(f"No tracks to add to playlist '{name}'.")
-                return
+        if remove_duplicates:
+            unique_uris = list(dict.fromkeys(track_uris))
+            if len(unique_uris) < len(track_uris):
+                logger.info(f"Removing {len(track_uris) - len(unique_uris)} duplicate tracks from playlist '{name}'")
+            track_uris = unique_uris
+
+        # Batches are appended one after another so the playlist keeps its original order
+        logger.info(f"Adding {len(track_uris)} tracks to playlist '{name}'...")
+        for i in range(0, len(track_uris), MAX_TRACKS_PER_ADD):
+            batch = track_uris[i:i + MAX_TRACKS_PER_ADD]
+            logger.debug("Adding batch %d to '%s' (%d tracks)", i // MAX_TRACKS_PER_ADD + 1, name, len(batch))
+            result = self._spotify_api_call(self.sp.playlist_add_items, playlist_id, batch)
+            if result is None:
+                 logger.error(f"Failed to add batch {i // MAX_TRACKS_PER_ADD + 1} to playlist '{name}'.")
+                 # Optionally: Decide whether to continue or stop
 
-            logger.info(f"Adding {len(track_uris)} tracks to playlist '{name}'...")
-            for i in range(0, len(track_uris), MAX_TRACKS_PER_ADD):
-                batch = track_uris[i:i + MAX_TRACKS_PER_ADD]
-                logger.debug(f"Adding batch {i // MAX_TRACKS_PER_ADD + 1} to '{name}' ({len(batch)} tracks)")
-                result = self._spotify_api_call(self.sp.playlist_add_items, new_playlist_id, batch)
-                if result is None:
-                     logger.error(f"Failed to add batch {i // MAX_TRACKS_PER_ADD + 1} to playlist '{name}'.")
-                     # Optionally: Decide whether to continue or stop
+        logger.info(f"Finished adding tracks to playlist '{name}'.")
 
-            logger.info(f"Finished adding tracks to playlist '{name}'.")
+    def create_playlist_and_add_tracks(self, name: str, public: bool, track_uris: List[str], images: Optional[List[Dict[str, Any]]] = None,
+                                       remove_duplicates: bool = False):
+        """
+        Creates a new playlist and adds tracks to it in batches. Optionally sets playlist cover image.
+        
+        Playlists may legitimately contain the same track more than once, so duplicates
+        are only dropped (keeping the first occurrence) when remove_duplicates is set.
+        """
+        if not self.sp or not self.user_id:
+            logger.error("Cannot create playlist: Spotify client not authenticated or user ID not found.")
+            return
 
+        try:
+            new_playlist_id = self._create_playlist(name, public)
+            if new_playlist_id:
+                self._populate_playlist(new_playlist_id, name, track_uris, images, remove_duplicates)
         except Exception as e: # Catch broader errors during the combined operation
             logger.error(f"An error occurred while creating or adding tracks to playlist '{name}': {e}", exc_info=True)
 
+    def import_playlists(self, playlists: List[Dict[str, Any]], remove_duplicates: bool = False) -> int:
+        """
+        Recreates several exported playlists.
+        
+        Playlists are created one at a time so they appear in the library in the
+        same order as the export; filling them (cover image and tracks) is then
+        done concurrently, with each playlist's own track batches kept in order.
+        Playlists this account already has at the exported snapshot (e.g. when
+        importing back into the source account) are skipped rather than duplicated.
+        
+        Returns:
+            The number of playlists created
+        """
+        if not self.sp or not self.user_id:
+            logger.error("Cannot create playlist: Spotify client not authenticated or user ID not found.")
+            return 0
+
+        # Exports made before snapshot IDs were recorded can't be matched, so skip the listing for them
+        existing_snapshots = {}
+        if any(playlist.get('snapshot_id') for playlist in playlists):
+            existing_snapshots = {p['id']: p.get('snapshot_id') for p in self.get_all_playlists()}
+
+        created = []
+        for i, playlist in enumerate(playlists, 1):
+            name = playlist.get('name', f'Imported Playlist {i}')
+            snapshot_id = playlist.get('snapshot_id')
+            if snapshot_id and existing_snapshots.get(playlist.get('id')) == snapshot_id:
+                logger.info(f"Playlist '{name}' already exists unchanged on this account - skipping")
+                continue
+            try:
+                new_playlist_id = self._create_playlist(name, playlist.get('public', False))
+            except Exception as e:
+                logger.error(f"An error occurred while creating playlist '{name}': {e}", exc_info=True)
+                continue
+            if new_playlist_id:
+                created.append((new_playlist_id, name, playlist))
+
+        def populate(entry):
+            new_playlist_id, name, playlist = entry
+            try:
+                self._populate_playlist(new_playlist_id, name, playlist.get('tracks', []), playlist.get('images', []),
+                                        remove_duplicates)
+            except Exception as e:
+                logger.error(f"An error occurred while adding tracks to playlist '{name}': {e}", exc_info=True)
+
+        with ThreadPoolExecutor(max_workers=MAX_WRITE_WORKERS) as executor:
+            list(executor.map(populate, created))
+        return len(created)
+
 
     def unfollow_playlist(self, playlist_id: str):
         """Unfollows (deletes) a playlist."""
         if not self.sp: return
-        logger.debug(f"Unfollowing playlist ID: {playlist_id}")
+        logger.debug("Unfollowing playlist ID: %s", playlist_id)
         result = self._spotify_api_call(self.sp.current_user_unfollow_playlist, playlist_id)
         if result is None:
              logger.error(f"Failed to unfollow playlist ID: {playlist_id}")
 
 
+    def unfollow_playlists(self, playlists: List[Dict[str, Any]]):
+        """Unfollows (deletes) several playlists concurrently; each request is independent."""
+        if not self.sp: return
+        total = len(playlists)
+
+        def unfollow(index: int, playlist: Dict[str, Any]):
+            logger.warning(f"Deleting playlist {index}/{total}: '{playlist.get('name', 'Unnamed Playlist')}'")
+            self.unfollow_playlist(playlist['id'])
+
+        with ThreadPoolExecutor(max_workers=MAX_WRITE_WORKERS) as executor:
+            list(executor.map(unfollow, range(1, total + 1), playlists))
+
     def remove_tracks_from_library(self, track_uris: List[str]):
-        """Removes tracks from the user's library (Liked Songs) in batches."""
+        """Removes tracks from the user's library (Liked Songs) in concurrent batches."""
         if not self.sp: return
         if not track_uris:
             logger.info("No liked songs to remove.")
             return
             
         logger.info(f"Removing {len(track_uris)} tracks from Liked Songs...")
-        for i in range(0, len(track_uris), MAX_TRACKS_PER_LIKE_DELETE):
-            batch = track_uris[i:i + MAX_TRACKS_PER_LIKE_DELETE]
-            logger.debug(f"Removing batch {i // MAX_TRACKS_PER_LIKE_DELETE + 1} of liked songs ({len(batch)} tracks)")
-            result = self._spotify_api_call(self.sp.current_user_saved_tracks_delete, tracks=batch)
-            if result is None:
-                 logger.error(f"Failed to remove batch {i // MAX_TRACKS_PER_LIKE_DELETE + 1} of liked songs.")
-                 # Optionally: Decide whether to continue or stop
+        self._send_library_batches(self.sp.current_user_saved_tracks_delete, track_uris, "remove")
         logger.info("Finished removing tracks from Liked Songs.")
 
     def upload_playlist_cover_image(self, playlist_id: str, image_url: str) -> bool:
@@ -365,7 +695,7 @@ class SpotifyManager:
             logger.debug(f"Downloading image from URL: {image_url}")
             
             # Download the image
-            response = requests.get(image_url, timeout=10)
+            response = self.session.get(image_url, timeout=10)
             response.raise_for_status()
             
             # Check content type